@@ -27,3 +27,6 @@ SOFTWARE.
 __version__ = '0.1'
 
 from .ledble import LedbleDriver
+from .sync import LedbleSyncClient, LedbleSyncDevice
+from .stream import ColorStream
+from .discovery import ScanResult, discover, scan
@@ -0,0 +1,193 @@
+"""
+
+MIT License
+
+Copyright (c) 2022 Jacob Smith
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import asyncio
+
+from typing import Any, AsyncIterator, Callable, Iterable, Union
+
+from bleak import BleakScanner
+
+from .ledble import LedbleDriver
+
+
+class ScanResult():
+    """
+    A compatible device seen while scanning, with the RSSI from every adapter that heard it.
+
+    Results are yielded on the first advertisement, so `rssi` and `best_adapter` only cover
+    the adapters heard from so far. They are complete once the scan has finished.
+    """
+
+    def __init__(self, address: str, name: Union[str, None]):
+        self.address = address
+        self.name = name
+        self.rssi = {}
+        self.devices = {}
+
+    def _seen(self, adapter: Union[str, None], device: Any, rssi: Union[int, None]) -> None:
+        self.devices[adapter] = device
+        self.rssi[adapter] = rssi
+
+    @property
+    def best_adapter(self) -> Union[str, None]:
+        """
+        The adapter with the strongest signal, None is the default adapter.
+        """
+        return max(self.rssi, key=lambda adapter: -1000 if self.rssi[adapter] is None else self.rssi[adapter])
+
+    @property
+    def best_rssi(self) -> Union[int, None]:
+        return self.rssi[self.best_adapter]
+
+    @property
+    def device(self) -> Any:
+        """
+        The BLEDevice as seen by best_adapter, pass it to connect_to_device.
+        """
+        return self.devices[self.best_adapter]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.address!r}, {self.name!r}, rssi={self.rssi!r})"
+
+
+async def scan(
+        adapters: Union[Iterable[Union[str, None]], None] = None,
+        addresses: Union[Iterable[str], None] = None,
+        count: Union[int, None] = None,
+        timeout: Union[float, None] = 10.0,
+        settle: float = 0.5,
+        compatible_name: Union[Callable[[str], bool], None] = None) -> AsyncIterator[ScanResult]:
+    """
+    Scan on every adapter at once, yielding each matching device as soon as its first advertisement arrives.
+
+    Matches are the `addresses` asked for, or otherwise any device with a compatible name.
+    Stops when every address has been found, `count` devices have been found, or after `timeout`.
+    Before stopping it keeps listening for up to `settle` seconds, until every adapter has
+    reported the devices found, so best_adapter is picked from all of them.
+
+    Stop early by closing the generator, otherwise the scanners keep running until it is
+    garbage collected (contextlib.aclosing needs Python 3.10, call `aclose()` otherwise):
+
+        async with contextlib.aclosing(ledble.scan(adapters=['hci0', 'hci1'])) as results:
+            async for result in results:
+                if ...:
+                    break
+    """
+    if compatible_name is None:
+        compatible_name = LedbleDriver().compatible_name
+
+    wanted = None
+    if addresses is not None:
+        wanted = {address.upper() for address in addresses}
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    results = {}
+    heard = asyncio.Event()
+    adapters = list(adapters or [None])
+
+    def detection_callback(adapter: Union[str, None]):
+        def callback(device, advertisement_data) -> None:
+            address = device.address.upper()
+            name = advertisement_data.local_name or device.name
+
+            if wanted is not None:
+                if address not in wanted:
+                    return
+            elif not name or not compatible_name(name):
+                return
+
+            rssi = getattr(advertisement_data, 'rssi', getattr(device, 'rssi', None))
+
+            result = results.get(address)
+            if result is None:
+                result = results[address] = ScanResult(address, name)
+                queue.put_nowait(result)
+
+            result._seen(adapter, device, rssi)
+            heard.set()
+
+        return callback
+
+    scanners = []
+    for adapter in adapters:
+        kwargs = {}
+        if adapter is not None:
+            kwargs['adapter'] = adapter
+
+        scanners.append(BleakScanner(detection_callback=detection_callback(adapter), **kwargs))
+
+    started = []
+
+    async def start(scanner: BleakScanner) -> None:
+        await scanner.start()
+        started.append(scanner)
+
+    try:
+        # Let every adapter finish starting before raising, so the finally stops all that did
+        for error in await asyncio.gather(*(start(scanner) for scanner in scanners), return_exceptions=True):
+            if isinstance(error, BaseException):
+                raise error
+
+        deadline = None if timeout is None else loop.time() + timeout
+        found = set()
+
+        while True:
+            if wanted is not None and wanted <= found:
+                break
+
+            if count is not None and len(found) >= count:
+                break
+
+            try:
+                result = await asyncio.wait_for(queue.get(), None if deadline is None else max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+
+            found.add(result.address)
+            yield result
+
+        # Give the other adapters a chance to report what was found
+        settle_end = loop.time() + settle
+        if deadline is not None:
+            settle_end = min(settle_end, deadline)
+
+        while any(len(results[address].rssi) < len(adapters) for address in found):
+            heard.clear()
+            try:
+                await asyncio.wait_for(heard.wait(), max(0.0, settle_end - loop.time()))
+            except asyncio.TimeoutError:
+                break
+
+    finally:
+        await asyncio.gather(*(scanner.stop() for scanner in started), return_exceptions=True)
+
+
+async def discover(*args, **kwargs) -> dict[str, ScanResult]:
+    """
+    Same as scan() but collects the results, keyed by address.
+    """
+    return {result.address: result async for result in scan(*args, **kwargs)}
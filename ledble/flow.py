@@ -0,0 +1,165 @@
+"""
+
+MIT License
+
+Copyright (c) 2022 Jacob Smith
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import asyncio
+import collections
+import time
+
+from typing import Union
+
+
+class FlowController():
+    """
+    Sliding window of unacknowledged writes, driven by notifications from the strip.
+
+    Each write takes a slot with `acquire()`, each notification frees the oldest
+    slot with `ack()` and gives a round trip time sample. A slot is given up after
+    `slot_timeout`, which follows the measured round trip time (smoothed RTT plus
+    four times its deviation, like TCP) between `min_timeout` and `timeout`.
+
+    If the first write times out without a single ack, or `max_losses` writes in a
+    row time out later on, the strip is treated as one that does not report back
+    and the window stops blocking altogether.
+    """
+
+    def __init__(self, window: int = 1, timeout: float = 1.0, min_timeout: float = 0.05, max_losses: int = 3):
+        self.window = max(1, window)
+        self.timeout = timeout
+        self.min_timeout = min(min_timeout, timeout)
+        self.max_losses = max(1, max_losses)
+
+        # None until we know, then True / False
+        self.supported = None
+
+        self._pending = collections.deque()
+        # Set by ack(), waiters clear it before waiting again
+        self._acked = asyncio.Event()
+
+        self.rtt = None
+        self.rtt_var = None
+        self.rtt_min = None
+        self.rtt_max = None
+        self.samples = 0
+        self.lost = 0
+        self._consecutive_lost = 0
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    @property
+    def slot_timeout(self) -> float:
+        """
+        How long an unacknowledged write holds its slot.
+        """
+        if self.rtt is None:
+            return self.timeout
+
+        return max(self.min_timeout, min(self.timeout, self.rtt + 4 * self.rtt_var))
+
+    async def _wait_for(self, predicate) -> None:
+        while not predicate():
+            self._acked.clear()
+            try:
+                await asyncio.wait_for(self._acked.wait(), max(0.0, self._pending[0] + self.slot_timeout - time.monotonic()))
+            except asyncio.TimeoutError:
+                self._expire()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        timeout = self.slot_timeout
+
+        while self._pending and now - self._pending[0] >= timeout:
+            self._pending.popleft()
+            self.lost += 1
+            self._consecutive_lost += 1
+
+        if not self.samples or self._consecutive_lost >= self.max_losses:
+            # Stopped reporting back (or never did), go back to the fixed delays
+            self.supported = False
+            self._pending.clear()
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot in the window and take it.
+        """
+        if self.supported is False:
+            return
+
+        await self._wait_for(lambda: len(self._pending) < self.window)
+
+        if self.supported is not False:
+            self._pending.append(time.monotonic())
+
+    async def drain(self) -> None:
+        """
+        Wait until every write has been acknowledged (or timed out).
+        """
+        if self.supported is False:
+            return
+
+        await self._wait_for(lambda: not self._pending)
+
+    def ack(self) -> Union[float, None]:
+        """
+        The strip reported back, free the oldest slot. Returns the round trip time.
+        """
+        if not self._pending:
+            return None
+
+        rtt = time.monotonic() - self._pending.popleft()
+
+        self.supported = True
+        self.samples += 1
+        self._consecutive_lost = 0
+
+        if self.rtt is None:
+            self.rtt = rtt
+            self.rtt_var = rtt / 2
+        else:
+            self.rtt_var += (abs(rtt - self.rtt) - self.rtt_var) * 0.25
+            self.rtt += (rtt - self.rtt) * 0.125
+
+        self.rtt_min = rtt if self.rtt_min is None else min(self.rtt_min, rtt)
+        self.rtt_max = rtt if self.rtt_max is None else max(self.rtt_max, rtt)
+
+        self._acked.set()
+
+        return rtt
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "supported": self.supported,
+            "window": self.window,
+            "outstanding": self.outstanding,
+            "rtt": self.rtt,
+            "rtt_min": self.rtt_min,
+            "rtt_max": self.rtt_max,
+            "slot_timeout": self.slot_timeout,
+            "samples": self.samples,
+            "lost": self.lost,
+            }
@@ -32,6 +32,7 @@ from typing import Any, Union
 from bleak import BleakClient, BleakScanner
 from bleak.exc import BleakError
 
+from .flow import FlowController
 from .util import BaseDriver, BLE_UUID, clamp_byte
 
 
@@ -165,7 +166,10 @@ class LedbleDriver(BaseDriver):
 
     def __init__(self):
         """Initialize object."""
-        pass
+        self._flow = None
+
+        # Called with every parsed notification, see parse_notification
+        self.on_notify = None
 
     def compatible_name(self, name: str) -> bool:
         """
@@ -179,12 +183,94 @@ class LedbleDriver(BaseDriver):
     async def connect_to_addr(self, mac_address: str, timeout: float = 2.0, adapter: Union[str, None] = None) -> None:
         await super().connect_to_addr(mac_address, timeout, adapter)
 
+
+    async def connect_to_device(self, device: Any) -> None:
+        # Subscriptions do not survive a reconnect, start_notify again if wanted
+        self._flow = None
+
+        await super().connect_to_device(device)
+
         await self._client.connect()
         self.log("connect")
 
 
+    async def start_notify(self, window: int = 1, timeout: float = 1.0) -> None:
+        """
+        Subscribe to notifications on CHARACTERISTIC.
+
+        Each report from the strip acknowledges the oldest unacknowledged write, which
+        limits writes in flight to `window` and measures the round trip time. Strips
+        that never report back, or stop reporting back, fall back to the fixed delays.
+        `timeout` is the longest a write waits for its acknowledgement.
+        """
+        self.log(f'{window=}, {timeout=}')
+
+        await self._client.start_notify(self.CHARACTERISTIC, self._handle_notify)
+        self._flow = FlowController(window, timeout)
+
+
+    async def stop_notify(self) -> None:
+        """
+        Unsubscribe from notifications, writes are no longer flow controlled.
+        """
+        self.log('stop')
+
+        self._flow = None
+        if self._client is not None and self._client.is_connected:
+            await self._client.stop_notify(self.CHARACTERISTIC)
+
+
+    def parse_notification(self, data: bytes) -> dict[str, Any]:
+        """
+        Split a notification up, framed ones look like the commands we send: 0x7E, length, command, ..., 0xEF
+        """
+        data = bytes(data)
+
+        if len(data) >= 4 and data[0] == 126 and data[-1] == 239:
+            return {"length": data[1], "command": data[2], "payload": data[3:-1], "raw": data}
+
+        return {"raw": data}
+
+
+    def _handle_notify(self, sender: Any, data: bytearray) -> None:
+        notification = self.parse_notification(data)
+
+        if self._flow is not None:
+            notification["rtt"] = self._flow.ack()
+
+        self.log(f'{notification=}')
+
+        if self.on_notify is not None:
+            self.on_notify(notification)
+
+
+    @property
+    def flow_stats(self) -> Union[dict[str, Any], None]:
+        """
+        Round trip time and window figures, None unless start_notify was called.
+        """
+        if self._flow is None:
+            return None
+
+        return self._flow.stats
+
+
+    async def _pace(self, seconds: float) -> None:
+        """
+        Give the strip time to process, waits for the acknowledgements when the strip sends them.
+        """
+        if self._flow is not None and self._flow.supported:
+            await self._flow.drain()
+        else:
+            await asyncio.sleep(seconds)
+
+
     async def _write_gatt(self, data: bytes) -> None:
         self.log(f'{data=}')
+
+        if self._flow is not None:
+            await self._flow.acquire()
+
         await self._client.write_gatt_char(self.CHARACTERISTIC, data)
 
 
@@ -280,14 +366,14 @@ class LedbleDriver(BaseDriver):
 
         # Begin DIY
         await self._write_gatt(bytes([126, 5, 14, style, 3, 255, 255, 0, 239]))
-        await asyncio.sleep(0.1)
+        await self._pace(0.1)
 
         for (r, g, b) in colors:
             # Set colors
             await self._write_gatt(bytes([126, 7, 16, 3, clamp_byte(r), clamp_byte(g), clamp_byte(b), 0, 239]))
-            await asyncio.sleep(0.1)
+            await self._pace(0.1)
 
-        await asyncio.sleep(0.2)
+        await self._pace(0.2)
         await self._write_gatt(bytes([126, 5, 15, style, 3, 255, 255, 0, 239]))
 
 
@@ -315,14 +401,14 @@ class LedbleDriver(BaseDriver):
 
         # Begin DIY
         await self._write_gatt(bytes([126, 5, 10, style, 3, 255, 255, 0, 239]))
-        await asyncio.sleep(0.1)
+        await self._pace(0.1)
 
         for (r, g, b) in colors:
             # Set colors
             await self._write_gatt(bytes([126, 7, 11, 3, clamp_byte(r), clamp_byte(g), clamp_byte(b), 0, 239]))
-            await asyncio.sleep(0.1)
+            await self._pace(0.1)
 
-        await asyncio.sleep(0.2)
+        await self._pace(0.2)
         await self._write_gatt(bytes([126, 5, 12, style, 3, 255, 255, 0, 239]))
 
 
@@ -0,0 +1,206 @@
+"""
+
+MIT License
+
+Copyright (c) 2022 Jacob Smith
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import asyncio
+import bisect
+import time
+
+from typing import Union
+
+from .util import clamp_byte, delta_e
+
+
+class ColorStream():
+    """
+    Sits between an effect producer and a driver's set_rgb.
+
+    Producers push timestamped keyframes at whatever rate they like, `run()`
+    resamples them (linear interpolation) at the rate the link can actually
+    sustain and skips any frame that is perceptually identical (delta E below
+    `threshold`) to the last one written to the strip.
+
+        stream = ColorStream(driver, threshold=2.3, fps=10)
+        task = asyncio.create_task(stream.run())
+        stream.push(255, 0, 0)
+        stream.push(0, 0, 255, at=time.monotonic() + 2.0)  # fade over 2 seconds
+        ...
+        await stream.stop()
+        print(stream.stats)
+    """
+
+    # Every set_rgb write is one 9 byte packet
+    FRAME_BYTES = 9
+
+    def __init__(self, driver, threshold: float = 2.3, fps: float = 10.0, delay: float = 0.0):
+        self.driver = driver
+        self.threshold = threshold
+        self.fps = fps
+        # Sample this far in the past, gives sparse keyframes something to interpolate towards.
+        self.delay = delay
+
+        self._keyframes = []
+        # Timestamps of _keyframes, kept in step for bisect (key= needs 3.10)
+        self._times = []
+        self._last_sent = None
+        self._write_time = 0.0
+        self._running = False
+        self._stopped = None
+
+        self.frames_pushed = 0
+        self.frames_sent = 0
+        self.frames_filtered = 0
+        self.keyframes_skipped = 0
+
+        # The keyframe the last sample started from
+        self._last_start = None
+
+    def push(self, r: int, g: int, b: int, at: Union[float, None] = None) -> None:
+        """
+        Add a keyframe, `at` is a time.monotonic() timestamp and defaults to now.
+        """
+        if at is None:
+            at = time.monotonic()
+
+        # After any keyframes with the same time, the latest push wins
+        index = bisect.bisect_right(self._times, at)
+        self._times.insert(index, at)
+        self._keyframes.insert(index, (at, (clamp_byte(r), clamp_byte(g), clamp_byte(b))))
+        self.frames_pushed += 1
+
+    def sample(self, at: float) -> Union[tuple[int, int, int], None]:
+        """
+        The color the keyframes describe at time `at`, drops keyframes that are no longer needed.
+        """
+        keyframes = self._keyframes
+        if not keyframes:
+            return None
+
+        index = bisect.bisect_right(self._times, at)
+
+        # Keep the last keyframe at or before `at`, everything older is history
+        if index > 1:
+            # Keyframes that went by between two ticks were never shown on their own
+            self.keyframes_skipped += sum(1 for frame in keyframes[:index - 1] if frame is not self._last_start)
+            del keyframes[:index - 1]
+            del self._times[:index - 1]
+            index = 1
+
+        if index == 0:
+            # Nothing has started yet
+            return None
+
+        self._last_start = keyframes[0]
+
+        start_time, start = keyframes[0]
+        if len(keyframes) == 1:
+            return start
+
+        end_time, end = keyframes[1]
+        if end_time <= start_time:
+            return end
+
+        t = (at - start_time) / (end_time - start_time)
+
+        return tuple(clamp_byte(round(s + (e - s) * t)) for s, e in zip(start, end))
+
+    @property
+    def interval(self) -> float:
+        """
+        Seconds between frames, never faster than the writes themselves complete.
+        """
+        return max(1.0 / self.fps, self._write_time)
+
+    async def _send(self, color: tuple[int, int, int]) -> None:
+        started = time.monotonic()
+        await self.driver.set_rgb(*color)
+        elapsed = time.monotonic() - started
+
+        # Smoothed write time, so a slow link lowers the frame rate instead of queueing.
+        if self._write_time:
+            self._write_time += (elapsed - self._write_time) * 0.2
+        else:
+            self._write_time = elapsed
+
+        self._last_sent = color
+        self.frames_sent += 1
+
+    async def tick(self, now: Union[float, None] = None) -> bool:
+        """
+        Sample once and write it if it is visibly different, returns True if a frame was sent.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        color = self.sample(now - self.delay)
+        if color is None or color == self._last_sent:
+            return False
+
+        if self._last_sent is not None and delta_e(color, self._last_sent) < self.threshold:
+            self.frames_filtered += 1
+            return False
+
+        await self._send(color)
+        return True
+
+    async def run(self) -> None:
+        """
+        Pump frames to the driver until stop() is called.
+        """
+        self._running = True
+        self._stopped = asyncio.Event()
+        try:
+            while self._running:
+                started = time.monotonic()
+                await self.tick(started)
+
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self._stopped.set()
+
+    async def stop(self) -> None:
+        """
+        Stop run(), waiting for any write in flight.
+        """
+        self._running = False
+        if self._stopped is not None:
+            await self._stopped.wait()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Savings are counted against the unfiltered tick stream, every tick whose sampled color
+        changed would have been a write without the delta E filter. Keyframes that resampling
+        passed over between two ticks are reported separately as keyframes_skipped.
+        """
+        return {
+            "frames_pushed": self.frames_pushed,
+            "frames_sent": self.frames_sent,
+            "frames_filtered": self.frames_filtered,
+            "keyframes_skipped": self.keyframes_skipped,
+            "bytes_sent": self.frames_sent * self.FRAME_BYTES,
+            "bytes_saved": self.frames_filtered * self.FRAME_BYTES,
+            "fps": 1.0 / self.interval,
+            }
@@ -0,0 +1,226 @@
+"""
+
+MIT License
+
+Copyright (c) 2022 Jacob Smith
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+
+from typing import Any, Union
+
+from bleak.exc import BleakError
+
+from .ledble import LedbleDriver
+
+
+class LedbleSyncClient():
+    """
+    Synchronous front end for one or more LED strips.
+
+    A single background thread runs the asyncio event loop and owns every BLE
+    connection, so any number of worker threads can share warm connections
+    instead of each doing their own `asyncio.run()` and reconnecting.
+
+        client = LedbleSyncClient(adapter='hci0')
+        strip = client.device("C0:00:00:00:02:37")
+        strip.set_on()                       # blocks until written
+        future = strip.submit('set_rgb', 255, 0, 0)  # fire and forget
+        client.close()
+    """
+
+    def __init__(self, adapter: Union[str, None] = None, timeout: float = 3.0, driver_class: type = LedbleDriver, notify: bool = False):
+        self._adapter = adapter
+        self._notify = notify
+        self._timeout = timeout
+        self._driver_class = driver_class
+
+        # Only ever touched from the loop thread.
+        self._drivers = {}
+        self._locks = {}
+
+        self._closing = False
+        self._closing_lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="ledble-loop", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the BLE thread, returns a concurrent.futures.Future
+        """
+        with self._closing_lock:
+            if self._closing:
+                coro.close()
+                raise RuntimeError("LedbleSyncClient is closed")
+
+            return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def call(self, coro, timeout: Union[float, None] = None) -> Any:
+        """
+        Run a coroutine on the BLE thread and block until it is done.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("call() would deadlock when used from the BLE thread, await the coroutine instead")
+
+        return self.submit(coro).result(timeout)
+
+    def device(self, mac_address: str) -> "LedbleSyncDevice":
+        """
+        Returns a blocking proxy for the strip at mac_address, connecting lazily on first use.
+        """
+        return LedbleSyncDevice(self, mac_address)
+
+    async def _invoke(self, mac_address: str, name: str, args: tuple, kwargs: dict) -> Any:
+        lock = self._locks.get(mac_address)
+        if lock is None:
+            lock = self._locks[mac_address] = asyncio.Lock()
+
+        # One command at a time per strip, multi-write commands like set_diy must not interleave.
+        async with lock:
+            driver = self._drivers.get(mac_address)
+
+            if driver is None or driver._client is None or not driver._client.is_connected:
+                driver = self._driver_class()
+                await driver.connect_to_addr(mac_address, self._timeout, self._adapter)
+                self._drivers[mac_address] = driver
+
+                if self._notify:
+                    try:
+                        await driver.start_notify()
+                    except BleakError as e:
+                        # Strip cant notify, carry on with the fixed delays
+                        driver.log(f"start_notify failed: {e}")
+
+            return await getattr(driver, name)(*args, **kwargs)
+
+    async def _disconnect(self, mac_address: str) -> None:
+        lock = self._locks.get(mac_address)
+        if lock is None:
+            return
+
+        async with lock:
+            driver = self._drivers.pop(mac_address, None)
+            if driver is not None and driver._client is not None:
+                await driver.disconnect()
+
+    async def _shutdown(self) -> None:
+        # Cancel whatever other threads are still waiting on, their futures raise CancelledError
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        drivers = list(self._drivers.values())
+        self._drivers.clear()
+
+        await asyncio.gather(*(driver.disconnect() for driver in drivers), return_exceptions=True)
+
+    def close(self, timeout: Union[float, None] = 10.0) -> None:
+        """
+        Cancel outstanding commands, disconnect every strip and stop the BLE thread.
+        """
+        with self._closing_lock:
+            if self._closing:
+                return
+            self._closing = True
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+
+            # A loop that is still running cant be closed, leave it to the daemon thread
+            if not self._thread.is_alive():
+                self._loop.close()
+
+
+class LedbleSyncDevice():
+    """
+    Blocking proxy for a single strip, every coroutine method of the driver is
+    available as a plain method, eg `device.set_rgb(255, 0, 0)`.
+
+    Connections are managed by the client, so the connect / notify coroutines are
+    not commands, use `disconnect()` to drop a strip's connection.
+    """
+
+    NOT_COMMANDS = {
+        "connect_to_addr",
+        "connect_to_device",
+        "disconnect",
+        "start_notify",
+        "stop_notify",
+        }
+
+    def __init__(self, client: LedbleSyncClient, mac_address: str):
+        self._client = client
+        # Same strip, same connection and lock, whatever case the address is given in
+        self.mac_address = mac_address.upper()
+
+    def disconnect(self, timeout: Union[float, None] = None) -> None:
+        """
+        Disconnect the strip, the next command reconnects.
+        """
+        self._client.call(self._client._disconnect(self.mac_address), timeout)
+
+    def submit(self, name: str, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Fire and forget version of a driver method, returns a concurrent.futures.Future
+        """
+        self._check_method(name)
+
+        return self._client.submit(self._client._invoke(self.mac_address, name, args, kwargs))
+
+    def _check_method(self, name: str):
+        method = getattr(self._client._driver_class, name, None)
+
+        if name.startswith('_') or name in self.NOT_COMMANDS or not inspect.iscoroutinefunction(method):
+            raise AttributeError(f"{self._client._driver_class.__name__} has no command {name!r}")
+
+        return method
+
+    def __getattr__(self, name: str):
+        method = self._check_method(name)
+
+        @functools.wraps(method)
+        def blocking(*args, **kwargs):
+            return self._client.call(self._client._invoke(self.mac_address, name, args, kwargs))
+
+        return blocking
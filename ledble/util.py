@@ -56,6 +56,13 @@ class BaseDriver():
         if not device:
             raise BleakError(f'A device with address {mac_address} could not be found')
 
+        await self.connect_to_device(device)
+
+    async def connect_to_device(self, device: Any) -> None:
+        """
+        Sets self._client to a BleakClient for an already scanned BLEDevice, see ledble.discovery.
+
+        """
         self._client = BleakClient(device, disconnected_callback=self._handle_disconnect)
 
     async def disconnect(self) -> None:
@@ -79,3 +86,41 @@ def BLE_UUID(uuid: int):
 def clamp_byte(value: int, minimum: int = 0, maximum: int = 255) -> int:
     return int(max(minimum, min(value, maximum)))
 
+
+
+def _srgb_to_linear(value: float) -> float:
+    value /= 255.
+    if value <= 0.04045:
+        return value / 12.92
+    return ((value + 0.055) / 1.055) ** 2.4
+
+
+def _lab_f(value: float) -> float:
+    if value > 216. / 24389.:
+        return value ** (1. / 3.)
+    return (value * 24389. / 27. + 16.) / 116.
+
+
+def rgb_to_lab(r: int, g: int, b: int) -> tuple[float, float, float]:
+    """
+    Convert an 8 bit sRGB color to CIE L*a*b* (D65 white point)
+    """
+    r, g, b = _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
+
+    x = (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) / 0.95047
+    y = (r * 0.2126729 + g * 0.7151522 + b * 0.0721750)
+    z = (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) / 1.08883
+
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+
+    return (116. * fy - 16., 500. * (fx - fy), 200. * (fy - fz))
+
+
+def delta_e(rgb1: tuple[int, int, int], rgb2: tuple[int, int, int]) -> float:
+    """
+    Perceptual difference (CIE76) between two RGB colors, ~2.3 is a just noticeable difference.
+    """
+    l1, a1, b1 = rgb_to_lab(*rgb1)
+    l2, a2, b2 = rgb_to_lab(*rgb2)
+
+    return ((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2) ** 0.5
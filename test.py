@@ -2,8 +2,6 @@ import asyncio
 import colorsys
 import platform
 
-from bleak import BleakScanner
-
 import ledble
 from ledble.util import clamp_byte
 
@@ -69,23 +67,18 @@ async def main():
         # hci1
         adapter='hci1'
 
-    if ADDRESS is None:
-        print("Finding a compatible device")
-        # devices = await BleakScanner.discover(adapter=adapter)
-        devices = await BleakScanner.discover()
-
-        for d in devices:
-            if driver.compatible_name(d.name):
-                ADDRESS = d.address
-                break
+    print("Finding a compatible device")
+    addresses = None if ADDRESS is None else [ADDRESS]
+    found = await ledble.discover(adapters=[adapter], addresses=addresses, count=1)
 
-        else:
-            print("Unable to find any compatible devices")
-            return
+    if not found:
+        print("Unable to find any compatible devices")
+        return
 
-    print(f"Connecting to {ADDRESS}")
+    result = next(iter(found.values()))
+    print(f"Connecting to {result.address} ({result.best_rssi} dBm)")
 
-    await driver.connect_to_addr(ADDRESS, adapter=adapter)
+    await driver.connect_to_device(result.device)
     print("Connected")
 
     # await driver.set_on()
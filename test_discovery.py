@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import ledble.discovery
+from ledble.discovery import discover
+
+
+class FakeDevice():
+    def __init__(self, address: str, name: str):
+        self.address = address
+        self.name = name
+
+
+class FakeAdvertisement():
+    def __init__(self, name: str, rssi: int):
+        self.local_name = name
+        self.rssi = rssi
+
+
+class FakeScanner():
+    """
+    Stands in for BleakScanner, ADVERTS maps adapter -> [(delay, address, name, rssi)]
+    """
+    ADVERTS = {}
+    FAILING = set()
+    log = []
+
+    def __init__(self, detection_callback=None, adapter=None):
+        self.callback = detection_callback
+        self.adapter = adapter
+        self.task = None
+
+    async def start(self) -> None:
+        if self.adapter in FakeScanner.FAILING:
+            await asyncio.sleep(0.01)
+            raise OSError(f"{self.adapter} missing")
+
+        FakeScanner.log.append(("start", self.adapter))
+        self.task = asyncio.create_task(self._advertise())
+
+    async def _advertise(self) -> None:
+        started = time.monotonic()
+        for delay, address, name, rssi in FakeScanner.ADVERTS.get(self.adapter, []):
+            await asyncio.sleep(max(0.0, started + delay - time.monotonic()))
+            self.callback(FakeDevice(address, name), FakeAdvertisement(name, rssi))
+
+    async def stop(self) -> None:
+        FakeScanner.log.append(("stop", self.adapter))
+        self.task.cancel()
+
+
+def run_discover(adverts: dict, failing: set = (), **kwargs):
+    FakeScanner.ADVERTS = adverts
+    FakeScanner.FAILING = set(failing)
+    FakeScanner.log = []
+
+    original = ledble.discovery.BleakScanner
+    ledble.discovery.BleakScanner = FakeScanner
+    try:
+        started = time.monotonic()
+        results = asyncio.run(discover(**kwargs))
+        return results, time.monotonic() - started
+    finally:
+        ledble.discovery.BleakScanner = original
+
+
+def test_count_settles_on_best_adapter():
+    results, elapsed = run_discover({
+        "hci0": [(0.01, "aa:01", "LEDBLE-1", -90)],
+        "hci1": [(0.03, "aa:01", "LEDBLE-1", -40)],
+        }, adapters=["hci0", "hci1"], count=1, timeout=5.0, settle=1.0)
+
+    result = results["AA:01"]
+    assert result.rssi == {"hci0": -90, "hci1": -40}
+    assert result.best_adapter == "hci1"
+    assert result.best_rssi == -40
+    # Both adapters reported, no need to wait out settle or timeout
+    assert elapsed < 0.5, elapsed
+
+
+def test_addresses_early_exit():
+    results, elapsed = run_discover({
+        None: [
+            (0.01, "aa:01", "Other", -50),
+            (0.02, "aa:02", "LEDBLE-2", -50),
+            (3.00, "aa:03", "LEDBLE-3", -50),
+            ],
+        }, addresses=["aa:01"], timeout=5.0)
+
+    # Asked for by address, so the name does not matter
+    assert list(results) == ["AA:01"]
+    assert elapsed < 0.5, elapsed
+
+
+def test_compatible_names_only():
+    results, elapsed = run_discover({
+        None: [
+            (0.01, "aa:01", "Other", -50),
+            (0.02, "aa:02", "LEDBLE-2", -50),
+            ],
+        }, count=1, timeout=5.0)
+
+    assert list(results) == ["AA:02"]
+
+
+def test_timeout_respected():
+    results, elapsed = run_discover({
+        "hci0": [(0.01, "aa:01", "LEDBLE-1", -60)],
+        }, adapters=["hci0", "hci1"], count=2, timeout=0.3, settle=5.0)
+
+    assert list(results) == ["AA:01"]
+    assert 0.25 <= elapsed < 0.6, elapsed
+
+
+def test_failed_adapter_stops_the_others():
+    try:
+        run_discover({}, failing={"hci1"}, adapters=["hci0", "hci1"], count=1)
+    except OSError:
+        pass
+    else:
+        raise AssertionError("missing adapter did not raise")
+
+    assert FakeScanner.log == [("start", "hci0"), ("stop", "hci0")]
+
+
+if __name__ == "__main__":
+    test_count_settles_on_best_adapter()
+    test_addresses_early_exit()
+    test_compatible_names_only()
+    test_timeout_respected()
+    test_failed_adapter_stops_the_others()
+    print("discovery ok")
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+from ledble.flow import FlowController
+
+
+async def acked_after(flow: FlowController, delay: float) -> None:
+    await asyncio.sleep(delay)
+    flow.ack()
+
+
+async def check_window_blocks():
+    """
+    A full window waits for an ack, then records the round trip time
+    """
+    flow = FlowController(window=2, timeout=1.0)
+
+    await flow.acquire()
+    await flow.acquire()
+    assert flow.outstanding == 2
+
+    asyncio.create_task(acked_after(flow, 0.05))
+
+    started = time.monotonic()
+    await flow.acquire()
+    waited = time.monotonic() - started
+
+    assert 0.04 <= waited < 0.5, waited
+    assert flow.supported is True
+    assert flow.samples == 1
+    assert flow.rtt_min >= 0.04
+    assert flow.outstanding == 2
+
+
+async def check_silent_strip():
+    """
+    No ack before the first timeout, the window stops blocking
+    """
+    flow = FlowController(window=1, timeout=0.1)
+
+    await flow.acquire()
+
+    started = time.monotonic()
+    await flow.acquire()
+    assert time.monotonic() - started < 0.3
+
+    assert flow.supported is False
+    assert flow.lost == 1
+    assert flow.outstanding == 0
+
+    started = time.monotonic()
+    for i in range(10):
+        await flow.acquire()
+    await flow.drain()
+    assert time.monotonic() - started < 0.05
+
+
+async def check_drain_timeout():
+    """
+    Once supported, missing acks only cost one slot timeout when draining
+    """
+    flow = FlowController(window=4, timeout=0.5, min_timeout=0.1)
+
+    await flow.acquire()
+    flow.ack()
+    await asyncio.sleep(0)
+
+    await flow.acquire()
+    await flow.acquire()
+
+    started = time.monotonic()
+    await flow.drain()
+    waited = time.monotonic() - started
+
+    assert 0.05 <= waited < 0.3, waited
+    assert flow.supported is True
+    assert flow.lost == 2
+    assert flow.outstanding == 0
+
+
+async def check_acked_then_silent():
+    """
+    A strip that stops reporting back falls back to the fixed delays after max_losses
+    """
+    flow = FlowController(window=1, timeout=1.0, min_timeout=0.05, max_losses=3)
+
+    await flow.acquire()
+    asyncio.create_task(acked_after(flow, 0.01))
+    await flow.drain()
+    assert flow.supported is True
+
+    # Slot timeout follows the measured round trip, not the 1s ceiling
+    assert flow.slot_timeout < 0.2, flow.slot_timeout
+
+    started = time.monotonic()
+    for i in range(6):
+        await flow.acquire()
+    waited = time.monotonic() - started
+
+    assert waited < 0.6, waited
+    assert flow.supported is False
+    assert flow.lost == 3
+
+
+def test_window_blocks():
+    asyncio.run(check_window_blocks())
+
+
+def test_silent_strip():
+    asyncio.run(check_silent_strip())
+
+
+def test_drain_timeout():
+    asyncio.run(check_drain_timeout())
+
+
+def test_acked_then_silent():
+    asyncio.run(check_acked_then_silent())
+
+
+if __name__ == "__main__":
+    test_window_blocks()
+    test_silent_strip()
+    test_drain_timeout()
+    test_acked_then_silent()
+    print("FlowController ok")
@@ -0,0 +1,109 @@
+import asyncio
+
+from ledble.stream import ColorStream
+from ledble.util import delta_e
+
+
+class FakeDriver():
+    def __init__(self):
+        self.sent = []
+
+    async def set_rgb(self, r, g, b) -> None:
+        self.sent.append((r, g, b))
+
+
+def test_delta_e_reference():
+    assert abs(delta_e((0, 0, 0), (255, 255, 255)) - 100.0) < 0.01
+    # CIE76 between sRGB red and blue
+    assert abs(delta_e((255, 0, 0), (0, 0, 255)) - 176.31) < 0.05
+    assert delta_e((10, 20, 30), (10, 20, 30)) == 0
+
+
+def test_interpolation_midpoint():
+    stream = ColorStream(FakeDriver())
+    stream.push(0, 0, 0, at=0.0)
+    stream.push(200, 100, 0, at=10.0)
+
+    assert stream.sample(-1.0) is None
+    assert stream.sample(5.0) == (100, 50, 0)
+    assert stream.sample(20.0) == (200, 100, 0)
+
+
+def test_same_time_latest_push_wins():
+    stream = ColorStream(FakeDriver())
+    stream.push(255, 0, 0, at=1.0)
+    stream.push(0, 0, 255, at=1.0)
+
+    assert stream.sample(1.0) == (0, 0, 255)
+
+
+def test_filtered_frames_counted():
+    driver = FakeDriver()
+    stream = ColorStream(driver, threshold=2.3)
+
+    async def run():
+        stream.push(100, 100, 100, at=0.0)
+        assert await stream.tick(0.0)
+
+        stream.push(101, 100, 100, at=1.0)
+        assert not await stream.tick(1.0)
+
+    asyncio.run(run())
+
+    assert driver.sent == [(100, 100, 100)]
+    assert stream.stats["frames_filtered"] == 1
+    assert stream.stats["bytes_saved"] == ColorStream.FRAME_BYTES
+    assert stream.stats["bytes_sent"] == ColorStream.FRAME_BYTES
+
+
+def test_slow_fade_still_sends():
+    driver = FakeDriver()
+    stream = ColorStream(driver, threshold=2.3)
+
+    async def run():
+        stream.push(100, 100, 100, at=0.0)
+        stream.push(120, 100, 100, at=20.0)
+        for now in range(21):
+            await stream.tick(float(now))
+
+    asyncio.run(run())
+
+    # Each step is too small to see, the accumulated change is not
+    assert len(driver.sent) >= 2
+    assert stream.frames_filtered >= 1
+    for before, after in zip(driver.sent, driver.sent[1:]):
+        assert delta_e(before, after) >= 2.3
+
+
+def test_keyframes_skipped():
+    stream = ColorStream(FakeDriver())
+    for at in (0.0, 1.0, 2.0, 3.0):
+        stream.push(0, 0, int(at * 10), at=at)
+
+    stream.sample(0.0)
+    stream.sample(3.5)
+    # 1.0 and 2.0 went by between samples, 0.0 was shown
+    assert stream.keyframes_skipped == 2
+
+    stream = ColorStream(FakeDriver())
+    stream.push(0, 0, 0, at=5.0)
+    stream.sample(5.0)
+
+    # Earlier than the shown keyframe, and never shown itself
+    stream.push(0, 0, 0, at=4.0)
+    stream.push(0, 0, 0, at=6.0)
+    stream.push(0, 0, 0, at=7.0)
+    stream.sample(7.5)
+
+    # 4.0 and 6.0 skipped, 5.0 was shown
+    assert stream.keyframes_skipped == 2
+
+
+if __name__ == "__main__":
+    test_delta_e_reference()
+    test_interpolation_midpoint()
+    test_same_time_latest_push_wins()
+    test_filtered_frames_counted()
+    test_slow_fade_still_sends()
+    test_keyframes_skipped()
+    print("ColorStream ok")
@@ -0,0 +1,138 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from ledble.sync import LedbleSyncClient
+
+
+class FakeClient():
+    def __init__(self):
+        self.is_connected = True
+
+
+class FakeDriver():
+    """
+    Just enough of LedbleDriver for LedbleSyncClient, records what happened
+    """
+    connects = []
+    calls = []
+    active = 0
+    overlap = False
+
+    def __init__(self):
+        self._client = None
+
+    def log(self, *args) -> None:
+        pass
+
+    async def connect_to_addr(self, mac_address, timeout=3.0, adapter=None) -> None:
+        FakeDriver.connects.append(mac_address)
+        self._client = FakeClient()
+
+    async def disconnect(self) -> None:
+        self._client.is_connected = False
+
+    async def set_rgb(self, r, g, b) -> None:
+        FakeDriver.active += 1
+        if FakeDriver.active > 1:
+            FakeDriver.overlap = True
+
+        FakeDriver.calls.append((threading.current_thread().name, (r, g, b)))
+        await asyncio.sleep(0.01)
+
+        FakeDriver.active -= 1
+
+    async def hang(self) -> None:
+        await asyncio.sleep(60)
+
+
+def reset():
+    FakeDriver.connects = []
+    FakeDriver.calls = []
+    FakeDriver.active = 0
+    FakeDriver.overlap = False
+
+
+def test_runs_on_loop_thread():
+    reset()
+    with LedbleSyncClient(driver_class=FakeDriver) as client:
+        client.device("aa:bb").set_rgb(1, 2, 3)
+
+    assert FakeDriver.calls == [("ledble-loop", (1, 2, 3))]
+
+
+def test_serialises_one_strip():
+    reset()
+    with LedbleSyncClient(driver_class=FakeDriver) as client:
+        threads = [threading.Thread(target=client.device("AA:BB").set_rgb, args=(i, 0, 0)) for i in range(8)]
+        threads += [threading.Thread(target=client.device("aa:bb").set_rgb, args=(i, 0, 0)) for i in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(client._drivers) == 1
+
+    assert len(FakeDriver.calls) == 16
+    assert FakeDriver.connects == ["AA:BB"]
+    assert not FakeDriver.overlap
+
+
+def test_reconnects():
+    reset()
+    with LedbleSyncClient(driver_class=FakeDriver) as client:
+        strip = client.device("AA:BB")
+        strip.set_rgb(1, 1, 1)
+
+        client._drivers["AA:BB"]._client.is_connected = False
+        strip.set_rgb(2, 2, 2)
+        assert len(FakeDriver.connects) == 2
+
+        strip.disconnect()
+        assert "AA:BB" not in client._drivers
+        strip.set_rgb(3, 3, 3)
+
+    assert len(FakeDriver.connects) == 3
+
+
+def test_close_cancels_and_rejects():
+    reset()
+    client = LedbleSyncClient(driver_class=FakeDriver)
+    strip = client.device("AA:BB")
+
+    future = strip.submit("hang")
+    time.sleep(0.05)
+
+    client.close()
+
+    try:
+        future.result(1.0)
+    except concurrent.futures.CancelledError:
+        pass
+    else:
+        raise AssertionError("pending future was not cancelled")
+
+    try:
+        strip.set_rgb(1, 2, 3)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("closed client accepted new work")
+
+
+def test_connection_methods_are_not_commands():
+    with LedbleSyncClient(driver_class=FakeDriver) as client:
+        strip = client.device("AA:BB")
+        for name in ("connect_to_addr", "_invoke"):
+            assert not hasattr(strip, name)
+
+
+if __name__ == "__main__":
+    test_runs_on_loop_thread()
+    test_serialises_one_strip()
+    test_reconnects()
+    test_close_cancels_and_rejects()
+    test_connection_methods_are_not_commands()
+    print("LedbleSyncClient ok")